@@ -15,18 +15,25 @@ from kivy.uix.popup import Popup
 from kivy.uix.filechooser import FileChooserIconView
 from kivy.uix.spinner import Spinner
 from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.graphics import Color, Rectangle
 from kivy.utils import platform
 
-from PIL import Image
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
+# PIL, docx and datetime are imported where used to keep app startup fast
 import os
 import io
+import math
 import json
-from datetime import datetime
+import hashlib
+import itertools
+import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # Faster settings serialization when available
+except ImportError:
+    orjson = None
 
 # Android permissions
 if platform == 'android':
@@ -37,6 +44,17 @@ if platform == 'android':
         Permission.CAMERA
     ])
 
+# Photo file extensions shown in the file chooser
+_PHOTO_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+
+def _get_mtime(path):
+    """Get file modification time, None if the file can't be read"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
 
 class PhotoGridCell(BoxLayout):
     """Individual photo grid cell with image and caption"""
@@ -47,6 +65,7 @@ class PhotoGridCell(BoxLayout):
         self.callback = callback
         self.remove_callback = remove_callback
         self.photo_path = None
+        self._photo_mtime = None
         
         # Image display
         self.image = KivyImage(
@@ -56,18 +75,11 @@ class PhotoGridCell(BoxLayout):
             size_hint=(1, 0.65)
         )
         
-        # Add background
-        with self.image.canvas.before:
-            Color(0.9, 0.9, 0.9, 1)
-            self.rect = Rectangle(size=self.image.size, pos=self.image.pos)
-        
-        self.image.bind(size=self._update_rect, pos=self._update_rect)
-        
         # Select button
         select_btn = Button(
             text='Select Photo',
             size_hint=(1, 0.12),
-            on_press=lambda x: self.callback(self.index)
+            on_press=self._on_select_press
         )
         
         # Caption and delete button layout
@@ -83,7 +95,7 @@ class PhotoGridCell(BoxLayout):
             text='✕ Del',
             size_hint=(0.25, 1),
             background_color=(1, 0.3, 0.3, 1),
-            on_press=lambda x: self.remove_callback(self.index)
+            on_press=self._on_delete_press
         )
         
         caption_layout.add_widget(self.caption_input)
@@ -93,15 +105,36 @@ class PhotoGridCell(BoxLayout):
         self.add_widget(select_btn)
         self.add_widget(caption_layout)
     
-    def _update_rect(self, instance, value):
-        self.rect.pos = instance.pos
-        self.rect.size = instance.size
+    def _on_select_press(self, _btn):
+        self.callback(self.index)
     
-    def set_photo(self, path):
-        """Set photo for this cell"""
+    def _on_delete_press(self, _btn):
+        self.remove_callback(self.index)
+    
+    def set_photo(self, path, thumb_path=None):
+        """Set photo for this cell, displaying thumb_path if given ('' shows nothing)"""
+        source = path if thumb_path is None else thumb_path
+        mtime = _get_mtime(source) if source else None
+        
+        if path == self.photo_path and self.image.source == source:
+            if mtime == self._photo_mtime:
+                return  # Already showing this file, skip re-decode
+            # Same file changed on disk - force texture refresh
+            self._photo_mtime = mtime
+            self.image.reload()
+            return
+        
+        # New source loads on assignment, no reload needed
         self.photo_path = path
-        self.image.source = path
-        self.image.reload()
+        self._photo_mtime = mtime
+        self.image.source = source
+    
+    def clear_photo(self):
+        """Clear photo without going through the image loader"""
+        self.photo_path = None
+        self._photo_mtime = None
+        self.image.source = ''
+        self.image.texture = None
     
     def get_caption(self):
         """Get caption text"""
@@ -109,18 +142,39 @@ class PhotoGridCell(BoxLayout):
     
     def set_caption(self, text):
         """Set caption text"""
+        if self.caption_input.text == text:
+            return  # Avoid TextInput re-layout
         self.caption_input.text = text
 
 
 class PhotoGridApp(App):
+    # Font size choices offered in the settings dialog
+    _TITLE_SIZES = tuple(str(i) for i in range(10, 25))
+    _CAPTION_SIZES = tuple(str(i) for i in range(6, 16))
+    
+    # Word export geometry per grid layout, sizes in inches
+    _LAYOUTS = {
+        # Dimensions that FIT on one page (tested and verified)
+        '2x1': dict(rows=2, cols=1, photos_per_page=2,
+                    col_width=7.5, row_height=4.0,
+                    max_img_width=7.0, max_img_height=3.4),
+        # Match desktop version - tighter spacing for 2x2
+        # (row_height reduced from 4.5, max_img_height from 3.8)
+        '2x2': dict(rows=2, cols=2, photos_per_page=4,
+                    col_width=3.55, row_height=4.0,
+                    max_img_width=3.3, max_img_height=3.4),
+    }
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.photos = []
+        self._photos_set = set()  # Mirrors self.photos for fast membership tests
+        self._assigned_count = 0  # Leading photos already distributed to pages by export
         self.current_page = 0
-        self.page_photos = {}
+        self._pages = []  # [page][grid_idx] -> (photo_path, caption), None if unset
         self.page_titles = {}
-        self.page_captions = {}
         self.photos_per_page = 4
+        self._max_page = 0  # Cached last page index, see _recompute_max_page
         self.grid_layout_type = '2x2'  # Default to 2x2
         
         # Settings
@@ -130,10 +184,11 @@ class PhotoGridApp(App):
         self.caption_font_size = 10
         self.caption_bold = False
         self.caption_underline = False
+        self.jpeg_optimize = False  # Smaller Word files at the cost of slower saves
         self.caption_prefix = 'Photo'
         self.header_text = ''
         self.footer_line1 = 'File Ref. :'
-        self.footer_line2 = f'Photo taken on {datetime.now().strftime("%d.%m.%Y")}'
+        self.footer_line2 = None  # Defaults to today's date if not in settings
         
         # Get storage path
         if platform == 'android':
@@ -143,9 +198,31 @@ class PhotoGridApp(App):
             self.storage_path = os.path.expanduser('~')
         
         self.settings_file = os.path.join(self.storage_path, 'photo_grid_settings.json')
+        self._last_settings_blob = None  # Last content written to settings_file
+        self._settings_write_scheduled = None  # Pending debounced settings write
+        self.thumb_cache_dir = os.path.join(self.storage_path, '.photo_grid_thumbs')
+        self._thumb_pool = ThreadPoolExecutor(max_workers=2)  # Keeps decoding off the UI thread
+        self._thumb_mem = {}  # photo_path -> (photo mtime, thumb_path) for thumbnails already made
+        self._thumb_pending = set()  # photo paths with a thumbnail job in flight
         self.last_photo_path = self.storage_path  # Remember last folder
         self.initializing = True  # Flag to prevent handlers during init
+        self._prefix_ev = None  # Pending debounced caption prefix update
+        self._pending_cell_index = None  # Cell to fill from file chooser, None for bulk add
+        self._settings_popup = None  # Built on first use, then reused
+        self._file_chooser_popup = None
+        self._remove_popup = None
+        self._message_popup = None  # Shared by all show_message calls
+        self._msg_label = None
+        self._doc_template = None  # Serialized blank export document, see _new_document
+        self._doc_template_key = None
+        self._last_save_hash = None  # Export state of the last saved document
+        self._last_save_path = None
+        self._remove_target = None  # (page_num, cell_index) awaiting remove confirmation
         self.load_settings()
+        
+        if self.footer_line2 is None:
+            from datetime import datetime
+            self.footer_line2 = f'Photo taken on {datetime.now().strftime("%d.%m.%Y")}'
     
     def build(self):
         """Build the main UI with modern design"""
@@ -284,13 +361,22 @@ class PhotoGridApp(App):
         
         main_layout.add_widget(grid_selector_layout)
         
-        # Photo grid (2x2)
+        # Photo grid (2x2) - cells are created once and reused across layout changes
         self.grid_container = GridLayout(cols=2, spacing=10, size_hint=(1, 0.7))
-        self.grid_cells = []
         
-        for i in range(4):
-            cell = PhotoGridCell(i, self.select_photo_for_cell, self.remove_photo_from_cell)
-            self.grid_cells.append(cell)
+        # Single shared background for the whole grid instead of one per cell
+        with self.grid_container.canvas.before:
+            Color(0.9, 0.9, 0.9, 1)
+            self._bg_rect = Rectangle(size=self.grid_container.size, pos=self.grid_container.pos)
+        
+        self.grid_container.bind(size=self._update_bg_rect, pos=self._update_bg_rect)
+        self._cell_pool = [
+            PhotoGridCell(i, self.select_photo_for_cell, self.remove_photo_from_cell)
+            for i in range(4)
+        ]
+        self.grid_cells = list(self._cell_pool)
+        
+        for cell in self.grid_cells:
             self.grid_container.add_widget(cell)
         
         main_layout.add_widget(self.grid_container)
@@ -315,6 +401,20 @@ class PhotoGridApp(App):
         
         return main_layout
     
+    def _update_bg_rect(self, instance, value):
+        self._bg_rect.pos = instance.pos
+        self._bg_rect.size = instance.size
+    
+    def on_pause(self):
+        """Persist pending settings - Android may kill a paused app"""
+        self.flush_settings()
+        return True
+    
+    def on_stop(self):
+        """Save pending settings and stop background thumbnail work when the app closes"""
+        self.flush_settings()
+        self._thumb_pool.shutdown(wait=False)
+    
     def change_layout(self, spinner, text):
         """Change grid layout between 2x1 and 2x2 and reorganize photos"""
         old_photos_per_page = self.photos_per_page
@@ -323,10 +423,6 @@ class PhotoGridApp(App):
         self.grid_layout_type = text
         print(f"DEBUG: Layout changed to: {text}")
         
-        # Clear existing grid
-        self.grid_container.clear_widgets()
-        self.grid_cells = []
-        
         if text == '2x1':
             self.grid_container.cols = 1
             self.photos_per_page = 2
@@ -338,43 +434,40 @@ class PhotoGridApp(App):
         
         # Reorganize photos if layout changed
         if old_photos_per_page != self.photos_per_page:
-            # Collect all photos in order
-            all_photos_ordered = []
-            old_page_photos = dict(self.page_photos)
-            old_page_captions = dict(self.page_captions)
-            
-            # Sort by page and position to maintain order
-            sorted_keys = sorted(old_page_photos.keys(), 
-                               key=lambda x: (int(x.split('_')[0]), int(x.split('_')[1])))
-            
-            for key in sorted_keys:
-                photo_path = old_page_photos[key]
-                caption = old_page_captions.get(key, '')
-                all_photos_ordered.append((photo_path, caption))
+            # Collect all photos in order (pages are already stored in order)
+            all_photos_ordered = [
+                (photo_path, caption)
+                for page in self._pages
+                for photo_path, caption in page
+                if photo_path is not None
+            ]
             
             # Clear old mappings
-            self.page_photos.clear()
-            self.page_captions.clear()
+            self._pages = []
+            self._assigned_count = 0
             
             # Redistribute photos with new layout
             for idx, (photo_path, caption) in enumerate(all_photos_ordered):
-                page_num = idx // self.photos_per_page
-                grid_idx = idx % self.photos_per_page
-                page_key = f'{page_num}_{grid_idx}'
-                
-                self.page_photos[page_key] = photo_path
-                if caption:
-                    self.page_captions[page_key] = caption
+                page = self._get_page(idx // self.photos_per_page)
+                page[idx % self.photos_per_page] = (photo_path, caption or None)
             
             # Reset to first page
             self.current_page = 0
         
-        # Rebuild grid
-        for i in range(num_cells):
-            cell = PhotoGridCell(i, self.select_photo_for_cell, self.remove_photo_from_cell)
-            self.grid_cells.append(cell)
+        # Reattach pooled cells instead of rebuilding them
+        for cell in self._cell_pool:
+            self.grid_container.remove_widget(cell)
+        
+        for cell in self._cell_pool[num_cells:]:
+            # Drop stale content from cells that are no longer shown
+            cell.clear_photo()
+            cell.set_caption('')
+        
+        self.grid_cells = self._cell_pool[:num_cells]
+        for cell in self.grid_cells:
             self.grid_container.add_widget(cell)
         
+        self._recompute_max_page()
         self.update_preview()
     
     def on_title_change(self, instance, value):
@@ -387,148 +480,232 @@ class PhotoGridApp(App):
         if hasattr(self, 'initializing') and self.initializing:
             return
         
-        new_prefix = value.strip()
+        # Debounce - apply once typing pauses instead of on every keystroke
+        if self._prefix_ev:
+            self._prefix_ev.cancel()
+        self._prefix_ev = Clock.schedule_once(self._apply_prefix, 0.25)
+    
+    def _apply_prefix(self, dt):
+        """Apply caption prefix from input to all captions and save"""
+        self._prefix_ev = None
+        new_prefix = self.caption_prefix_input.text.strip()
         if new_prefix and new_prefix != self.caption_prefix and len(new_prefix) > 0:
             self.caption_prefix = new_prefix
             try:
-                if self.page_photos:
+                if self._pages:
                     self.update_all_captions_with_prefix()
                     self.update_preview()
                 self.save_settings()
             except Exception as e:
                 print(f'Error updating caption prefix: {e}')
     
+    def _recompute_max_page(self):
+        """Update cached last page index after photos or photos_per_page change"""
+        self._max_page = max(0, (len(self.photos) + self.photos_per_page - 1) // self.photos_per_page - 1)
+    
     def change_page(self, direction):
         """Navigate between pages"""
-        max_page = max(0, (len(self.photos) + self.photos_per_page - 1) // self.photos_per_page - 1)
-        
         new_page = self.current_page + direction
-        if 0 <= new_page <= max_page:
+        if 0 <= new_page <= self._max_page:
             self.current_page = new_page
             self.update_preview()
     
     def update_preview(self):
         """Update the grid preview for current page"""
-        max_page = max(0, (len(self.photos) + self.photos_per_page - 1) // self.photos_per_page - 1)
-        self.page_label.text = f'Page {self.current_page + 1} of {max_page + 1}'
+        page_text = f'Page {self.current_page + 1} of {self._max_page + 1}'
+        if self.page_label.text != page_text:
+            self.page_label.text = page_text  # Avoid re-rendering unchanged label
         
-        # Update title
-        if self.current_page in self.page_titles:
-            self.title_input.text = self.page_titles[self.current_page]
-        else:
-            self.title_input.text = 'Title'
+        # Update title (skip TextInput re-layout if unchanged)
+        title = self.page_titles.get(self.current_page, 'Title')
+        if self.title_input.text != title:
+            self.title_input.text = title
         
-        # Update grid cells
+        # Update grid cells - captions are only formatted when none is saved
+        start_idx = self.current_page * self.photos_per_page
         for i in range(len(self.grid_cells)):
-            page_key = f'{self.current_page}_{i}'
+            photo_path, caption = self._get_slot(self.current_page, i)
             
-            if page_key in self.page_photos:
+            if photo_path is not None:
                 # Photo exists in this position
-                self.grid_cells[i].set_photo(self.page_photos[page_key])
+                self._show_photo(self.grid_cells[i], photo_path)
                 
                 # Set caption - use saved caption or generate default
-                if page_key in self.page_captions:
-                    self.grid_cells[i].set_caption(self.page_captions[page_key])
+                if caption is not None:
+                    self.grid_cells[i].set_caption(caption)
                 else:
                     # Generate default caption
-                    start_idx = self.current_page * self.photos_per_page
                     default_caption = f'{self.caption_prefix} {start_idx + i + 1}'
-                    self.page_captions[page_key] = default_caption
+                    self._get_page(self.current_page)[i] = (photo_path, default_caption)
                     self.grid_cells[i].set_caption(default_caption)
             else:
                 # No photo assigned to this position yet
-                start_idx = self.current_page * self.photos_per_page
                 if start_idx + i < len(self.photos):
                     photo_path = self.photos[start_idx + i]
-                    self.page_photos[page_key] = photo_path
-                    self.grid_cells[i].set_photo(photo_path)
+                    self._show_photo(self.grid_cells[i], photo_path)
                     
                     # Generate caption with correct sequential number
                     photo_num = start_idx + i + 1
                     default_caption = f'{self.caption_prefix} {photo_num}'
-                    self.page_captions[page_key] = default_caption
+                    self._get_page(self.current_page)[i] = (photo_path, default_caption)
                     self.grid_cells[i].set_caption(default_caption)
                 else:
                     # Empty cell
-                    self.grid_cells[i].set_photo('')
+                    self.grid_cells[i].clear_photo()
                     self.grid_cells[i].set_caption('')
     
+    def _get_page(self, page_num):
+        """Get slot list for page, adding empty pages up to it as needed"""
+        while len(self._pages) <= page_num:
+            self._pages.append([(None, None)] * self.photos_per_page)
+        return self._pages[page_num]
+    
+    def _get_slot(self, page_num, grid_idx):
+        """Get (photo_path, caption) for grid position, (None, None) if unassigned"""
+        if page_num < len(self._pages):
+            return self._pages[page_num][grid_idx]
+        return (None, None)
+    
+    def _show_photo(self, cell, path):
+        """Show photo in cell, generating its thumbnail in the background if needed"""
+        cached = self._thumb_mem.get(path)
+        if cached is not None and cached[0] == _get_mtime(path):
+            cell.set_photo(path, cached[1])
+            return
+        
+        # Show the outdated thumbnail, or an empty placeholder, until the new one is ready
+        cell.set_photo(path, cached[1] if cached is not None else '')
+        if path not in self._thumb_pending:
+            self._thumb_pending.add(path)
+            self._thumb_pool.submit(self._make_thumb, path)
+    
+    def _make_thumb(self, path):
+        """Worker thread: create thumbnail and hand it back to the UI thread"""
+        mtime = _get_mtime(path)
+        thumb_path = self._get_thumb(path)
+        Clock.schedule_once(lambda dt: self._on_thumb_ready(path, mtime, thumb_path), 0)
+    
+    def _on_thumb_ready(self, path, mtime, thumb_path):
+        """Show finished thumbnail in any cell still displaying its photo"""
+        self._thumb_pending.discard(path)
+        self._thumb_mem[path] = (mtime, thumb_path)
+        for cell in self.grid_cells:
+            if cell.photo_path == path:
+                cell.set_photo(path, thumb_path)
+    
+    def _get_thumb(self, path):
+        """Get cached preview thumbnail for photo, creating it on first use"""
+        from PIL import Image
+        
+        try:
+            key = f'{path}{os.path.getmtime(path)}'
+            thumb_name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.jpg'
+            thumb_path = os.path.join(self.thumb_cache_dir, thumb_name)
+            
+            if not os.path.exists(thumb_path):
+                os.makedirs(self.thumb_cache_dir, exist_ok=True)
+                # Close the source file as soon as the thumbnail is written
+                with Image.open(path) as im:
+                    # Downscale before dropping alpha; palette images only resize with NEAREST
+                    if im.mode == 'P':
+                        im = im.convert('RGB')
+                    im.thumbnail((512, 512), Image.Resampling.LANCZOS)
+                    if im.mode in ('RGBA', 'LA'):
+                        im = im.convert('RGB')
+                    # Write to temp file then swap in, so a killed app can't leave a truncated thumbnail
+                    tmp_path = thumb_path + '.tmp'
+                    im.save(tmp_path, 'JPEG', quality=85)
+                os.replace(tmp_path, thumb_path)
+            
+            return thumb_path
+        except Exception as e:
+            print(f'Failed to create thumbnail: {e}')
+            return path  # Fall back to full-resolution photo
+    
     def select_photo_for_cell(self, cell_index):
         """Show file chooser for selecting photo"""
-        self.selected_cell_index = cell_index
+        self._pending_cell_index = cell_index
         self.show_file_chooser()
     
     def update_all_captions_with_prefix(self):
         """Update all captions to use new prefix while maintaining numbers"""
-        if not self.page_photos:
+        if not self._pages:
             return
         
-        # Sort all page_photos by page and position to get correct order
-        try:
-            sorted_keys = sorted(self.page_photos.keys(), 
-                               key=lambda x: (int(x.split('_')[0]), int(x.split('_')[1])))
-            
-            # Update each caption with new prefix, keeping the sequential number
-            for idx, page_key in enumerate(sorted_keys):
-                photo_num = idx + 1
-                new_caption = f'{self.caption_prefix} {photo_num}'
-                self.page_captions[page_key] = new_caption
-        except Exception as e:
-            print(f'Error updating captions: {e}')
-            # Fallback: just update visible captions
-            for i in range(len(self.grid_cells)):
-                page_key = f'{self.current_page}_{i}'
-                if page_key in self.page_photos:
-                    self.page_captions[page_key] = f'{self.caption_prefix} {i + 1}'
+        # Pages are stored in order, so a single walk gives the sequence.
+        # Rebuild each page in one comprehension, keeping the sequential number
+        prefix = self.caption_prefix
+        photo_nums = itertools.count(1)
+        self._pages = [
+            [(slot[0], f'{prefix} {next(photo_nums)}') if slot[0] is not None else slot
+             for slot in page]
+            for page in self._pages
+        ]
     
     def remove_photo_from_cell(self, cell_index):
         """Remove photo from specific cell permanently"""
-        page_key = f'{self.current_page}_{cell_index}'
-        if page_key in self.page_photos:
+        if self._get_slot(self.current_page, cell_index)[0] is not None:
             # Show confirmation
-            content = BoxLayout(orientation='vertical', padding=10, spacing=10)
-            content.add_widget(Label(text='Remove this photo from the grid?\n(Will not reappear on page navigation)'))
-            
-            button_layout = BoxLayout(size_hint=(1, 0.3), spacing=10)
-            yes_btn = Button(text='Yes', background_color=(1, 0.3, 0.3, 1))
-            no_btn = Button(text='No')
-            button_layout.add_widget(yes_btn)
-            button_layout.add_widget(no_btn)
-            content.add_widget(button_layout)
-            
-            popup = Popup(title='Remove Photo', content=content, size_hint=(0.8, 0.35))
-            
-            def on_yes(instance):
-                # Remove from page_photos and page_captions
-                photo_path = self.page_photos[page_key]
-                del self.page_photos[page_key]
-                if page_key in self.page_captions:
-                    del self.page_captions[page_key]
-                
-                # Also remove from global photos list to prevent reappearing
-                if photo_path in self.photos:
-                    self.photos.remove(photo_path)
-                
-                # Clear the cell
-                self.grid_cells[cell_index].set_photo('')
-                self.grid_cells[cell_index].set_caption('')
-                popup.dismiss()
+            if self._remove_popup is None:
+                self._remove_popup = self._build_remove_popup()
+            self._remove_target = (self.current_page, cell_index)
+            self._remove_popup.open()
+    
+    def _build_remove_popup(self):
+        """Build remove confirmation dialog once, reused by remove_photo_from_cell"""
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        content.add_widget(Label(text='Remove this photo from the grid?\n(Will not reappear on page navigation)'))
+        
+        button_layout = BoxLayout(size_hint=(1, 0.3), spacing=10)
+        yes_btn = Button(text='Yes', background_color=(1, 0.3, 0.3, 1))
+        no_btn = Button(text='No')
+        button_layout.add_widget(yes_btn)
+        button_layout.add_widget(no_btn)
+        content.add_widget(button_layout)
+        
+        popup = Popup(title='Remove Photo', content=content, size_hint=(0.8, 0.35))
+        
+        def on_yes(instance):
+            page_num, cell_index = self._remove_target
             
-            def on_no(instance):
-                popup.dismiss()
+            # Remove photo and caption from its page slot
+            photo_path = self._pages[page_num][cell_index][0]
+            self._pages[page_num][cell_index] = (None, None)
             
-            yes_btn.bind(on_press=on_yes)
-            no_btn.bind(on_press=on_no)
+            # Also remove from global photos list to prevent reappearing
+            if photo_path in self._photos_set:
+                self._photos_set.discard(photo_path)
+                self.photos.remove(photo_path)
+                self._assigned_count = 0  # Indexes shifted, redistribute on next export
+                self._recompute_max_page()
             
-            popup.open()
+            # Clear the cell
+            self.grid_cells[cell_index].clear_photo()
+            self.grid_cells[cell_index].set_caption('')
+            popup.dismiss()
+        
+        def on_no(instance):
+            popup.dismiss()
+        
+        yes_btn.bind(on_press=on_yes)
+        no_btn.bind(on_press=on_no)
+        
+        return popup
     
     def show_file_chooser(self, *args):
         """Show file chooser dialog with multiple selection"""
+        if self._file_chooser_popup is None:
+            self._file_chooser_popup = self._build_file_chooser_popup()
+        self._file_chooser_popup.open()
+    
+    def _build_file_chooser_popup(self):
+        """Build file chooser dialog once, reused by show_file_chooser"""
         content = BoxLayout(orientation='vertical')
         
         file_chooser = FileChooserIconView(
             path=self.last_photo_path,  # Remember last folder
-            filters=['*.jpg', '*.jpeg', '*.png', '*.bmp', '*.gif'],
+            # One suffix check per file instead of fnmatch against each glob
+            filters=[lambda folder, filename: filename.lower().endswith(_PHOTO_EXTS)],
             multiselect=True  # Enable multiple selection
         )
         
@@ -549,40 +726,64 @@ class PhotoGridApp(App):
         )
         
         def on_select(instance):
-            if file_chooser.selection:
-                # Remember the folder for next time
-                if file_chooser.selection:
-                    self.last_photo_path = os.path.dirname(file_chooser.selection[0])
-                
-                if hasattr(self, 'selected_cell_index'):
-                    # Single cell selection
-                    photo_path = file_chooser.selection[0]
-                    page_key = f'{self.current_page}_{self.selected_cell_index}'
-                    self.page_photos[page_key] = photo_path
-                    if photo_path not in self.photos:
-                        self.photos.append(photo_path)
-                    self.grid_cells[self.selected_cell_index].set_photo(photo_path)
-                    delattr(self, 'selected_cell_index')  # Clear selection
-                else:
-                    # Bulk add - multiple photos
-                    for photo_path in file_chooser.selection:
-                        if photo_path not in self.photos:
-                            self.photos.append(photo_path)
-                    self.update_preview()
+            # Close right away and fill the grid on the next frame
+            paths = list(file_chooser.selection)
+            cell_index = self._pending_cell_index
+            self._pending_cell_index = None  # Clear selection
             popup.dismiss()
+            Clock.schedule_once(lambda dt: self._apply_selection(paths, cell_index), 0)
         
         def on_cancel(instance):
-            if hasattr(self, 'selected_cell_index'):
-                delattr(self, 'selected_cell_index')  # Clear selection
+            self._pending_cell_index = None  # Clear selection
             popup.dismiss()
         
+        def on_pre_open(instance):
+            if file_chooser.path == self.last_photo_path:
+                # Same folder re-lists only on path/filters change - rescan for new photos
+                file_chooser._trigger_update()
+            else:
+                file_chooser.path = self.last_photo_path  # Remember last folder
+            file_chooser.selection = []
+        
         select_btn.bind(on_press=on_select)
         cancel_btn.bind(on_press=on_cancel)
+        popup.bind(on_pre_open=on_pre_open)
         
-        popup.open()
+        return popup
+    
+    def _apply_selection(self, paths, cell_index=None):
+        """Add photos picked in the file chooser to cell_index, or bulk add if None"""
+        if paths:
+            # Remember the folder for next time
+            self.last_photo_path = os.path.dirname(paths[0])
+            
+            if cell_index is not None:
+                # Single cell selection
+                photo_path = paths[0]
+                page = self._get_page(self.current_page)
+                page[cell_index] = (photo_path, page[cell_index][1])
+                if photo_path not in self._photos_set:
+                    self._photos_set.add(photo_path)
+                    self.photos.append(photo_path)
+                    self._recompute_max_page()
+                self._show_photo(self.grid_cells[cell_index], photo_path)
+            else:
+                # Bulk add - multiple photos
+                for photo_path in paths:
+                    if photo_path not in self._photos_set:
+                        self._photos_set.add(photo_path)
+                        self.photos.append(photo_path)
+                self._recompute_max_page()
+                self.update_preview()
     
     def show_settings(self, *args):
         """Show settings dialog with font options"""
+        if self._settings_popup is None:
+            self._settings_popup = self._build_settings_popup()
+        self._settings_popup.open()
+    
+    def _build_settings_popup(self):
+        """Build settings dialog once, reused by show_settings"""
         from kivy.uix.checkbox import CheckBox
         
         content = BoxLayout(orientation='vertical', padding=10, spacing=5)
@@ -613,7 +814,7 @@ class PhotoGridApp(App):
         title_size_layout.add_widget(Label(text='Size:', size_hint=(0.3, 1)))
         title_size_spinner = Spinner(
             text=str(self.title_font_size),
-            values=[str(i) for i in range(10, 25)],
+            values=self._TITLE_SIZES,
             size_hint=(0.7, 1)
         )
         title_size_layout.add_widget(title_size_spinner)
@@ -643,7 +844,7 @@ class PhotoGridApp(App):
         caption_size_layout.add_widget(Label(text='Size:', size_hint=(0.3, 1)))
         caption_size_spinner = Spinner(
             text=str(self.caption_font_size),
-            values=[str(i) for i in range(6, 16)],
+            values=self._CAPTION_SIZES,
             size_hint=(0.7, 1)
         )
         caption_size_layout.add_widget(caption_size_spinner)
@@ -693,6 +894,13 @@ class PhotoGridApp(App):
         footer2_layout.add_widget(footer2_input)
         scroll_content.add_widget(footer2_layout)
         
+        # Export image compression
+        optimize_layout = BoxLayout(size_hint=(1, None), height=35)
+        optimize_check = CheckBox(active=self.jpeg_optimize, size_hint=(0.15, 1))
+        optimize_layout.add_widget(optimize_check)
+        optimize_layout.add_widget(Label(text='Smaller file (slower save)', size_hint=(0.85, 1)))
+        scroll_content.add_widget(optimize_layout)
+        
         scroll.add_widget(scroll_content)
         content.add_widget(scroll)
         
@@ -719,16 +927,19 @@ class PhotoGridApp(App):
             self.caption_font_size = int(caption_size_spinner.text)
             self.caption_bold = caption_bold_check.active
             self.caption_underline = caption_underline_check.active
+            self.jpeg_optimize = optimize_check.active
             self.caption_prefix = new_prefix
             self.header_text = header_input.text
             self.footer_line1 = footer1_input.text
             self.footer_line2 = footer2_input.text
             
             # Update all captions if prefix changed
-            if prefix_changed and self.page_photos:
+            if prefix_changed and self._pages:
                 self.update_all_captions_with_prefix()
             
+            # Apply is one deliberate action - write now so the message below is true
             self.save_settings()
+            self.flush_settings()
             self.update_preview()  # Refresh display
             self.show_message('Settings Saved', 'Your settings have been saved!')
             popup.dismiss()
@@ -736,10 +947,24 @@ class PhotoGridApp(App):
         def on_cancel(instance):
             popup.dismiss()
         
+        def on_pre_open(instance):
+            # Refresh fields from current settings
+            title_size_spinner.text = str(self.title_font_size)
+            title_bold_check.active = self.title_bold
+            title_underline_check.active = self.title_underline
+            caption_size_spinner.text = str(self.caption_font_size)
+            caption_bold_check.active = self.caption_bold
+            caption_underline_check.active = self.caption_underline
+            optimize_check.active = self.jpeg_optimize
+            header_input.text = self.header_text
+            footer1_input.text = self.footer_line1
+            footer2_input.text = self.footer_line2
+        
         apply_btn.bind(on_press=on_apply)
         cancel_btn.bind(on_press=on_cancel)
+        popup.bind(on_pre_open=on_pre_open)
         
-        popup.open()
+        return popup
     
     def reset_project(self, *args):
         """Reset all photos and settings"""
@@ -757,10 +982,12 @@ class PhotoGridApp(App):
         
         def on_yes(instance):
             self.photos = []
-            self.page_photos = {}
+            self._photos_set = set()
+            self._assigned_count = 0
+            self._pages = []
             self.page_titles = {}
-            self.page_captions = {}
             self.current_page = 0
+            self._recompute_max_page()
             self.update_preview()
             popup.dismiss()
         
@@ -792,6 +1019,7 @@ class PhotoGridApp(App):
         ))
         
         # Default filename
+        from datetime import datetime
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         default_name = f'photo_grid_{timestamp}'
         
@@ -860,6 +1088,11 @@ class PhotoGridApp(App):
 
     def generate_word_document(self, filename):
         """Generate Word document with photos - BULLETPROOF VERSION"""
+        from docx.shared import Inches, Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.enum.table import WD_TABLE_ALIGNMENT
+        
+        compressed = {}  # photo_path -> future of compress_image result
         try:
             # Step 1: Determine layout from CURRENT UI state (grid_spinner.text)
             # This ensures we use what the user sees, not a stale variable
@@ -869,105 +1102,87 @@ class PhotoGridApp(App):
             print(f"DEBUG: grid_layout_type: {self.grid_layout_type}")
             print(f"DEBUG: photos_per_page: {self.photos_per_page}")
             
-            if current_layout == '2x1':
-                rows, cols = 2, 1
-                photos_per_page = 2
-                # Dimensions that FIT on one page (tested and verified)
-                col_width = Inches(7.5)
-                row_height = Inches(4.0)  # Fits on page
-                max_img_width = Inches(7.0)
-                max_img_height = Inches(3.4)  # Fits on page
-            else:  # 2x2
-                rows, cols = 2, 2
-                photos_per_page = 4
-                # Match desktop version - tighter spacing for 2x2
-                col_width = Inches(3.55)
-                row_height = Inches(4.0)  # Reduced from 4.5 for tighter spacing
-                max_img_width = Inches(3.3)
-                max_img_height = Inches(3.4)  # Reduced from 3.8
+            layout = self._LAYOUTS['2x1' if current_layout == '2x1' else '2x2']
+            rows, cols = layout['rows'], layout['cols']
+            photos_per_page = layout['photos_per_page']
+            col_width = Inches(layout['col_width'])
+            row_height = Inches(layout['row_height'])
+            max_img_width = Inches(layout['max_img_width'])
+            max_img_height = Inches(layout['max_img_height'])
             
             print(f"DEBUG: Using photos_per_page: {photos_per_page}, rows: {rows}, cols: {cols}")
             
+            # Layout constants used for every page/photo, built once per save
+            # Spacing that FITS on one page (tested and verified) - compact for 2x2
+            space_after_title = Pt(2) if current_layout == '2x1' else Pt(4)
+            space_zero = Pt(0)
+            space_before_caption = Pt(2)  # EXACT copy from desktop version (2x2 reduced from 3)
+            max_img_ratio = max_img_width.inches / max_img_height.inches
+            title_font_size = Pt(self.title_font_size)
+            caption_font_size = Pt(self.caption_font_size)
+            
             # Step 2: Ensure ALL photos are distributed to pages
-            # BUT preserve existing page_photos and page_captions (don't overwrite!)
+            # BUT preserve existing page photos and captions (don't overwrite!)
             # This is critical - only fill in missing photos, don't reorganize existing ones
-            for idx, photo_path in enumerate(self.photos):
-                page_num = idx // photos_per_page
+            # Photos before _assigned_count were handled by a previous export
+            for idx in range(self._assigned_count, len(self.photos)):
+                photo_path = self.photos[idx]
+                page = self._get_page(idx // photos_per_page)
                 grid_idx = idx % photos_per_page
-                page_key = f'{page_num}_{grid_idx}'
                 
                 # Only add if not already assigned (preserve manual assignments and captions)
-                if page_key not in self.page_photos:
-                    self.page_photos[page_key] = photo_path
+                if page[grid_idx][0] is None:
+                    caption = page[grid_idx][1]
                     
                     # Only set default caption if not already set
-                    if page_key not in self.page_captions:
-                        self.page_captions[page_key] = f'{self.caption_prefix} {idx + 1}'
+                    if caption is None:
+                        caption = f'{self.caption_prefix} {idx + 1}'
+                    page[grid_idx] = (photo_path, caption)
+            self._assigned_count = len(self.photos)
             
-            # Step 3: Create document
-            doc = Document()
-            
-            # Step 4: Set margins
-            for section in doc.sections:
-                section.top_margin = Inches(0.8)
-                section.bottom_margin = Inches(0.8)
-                section.left_margin = Inches(0.5)
-                section.right_margin = Inches(0.5)
-                
-                # Add header safely
-                try:
-                    if self.header_text and self.header_text.strip():
-                        header = section.header
-                        if header.paragraphs:
-                            header_para = header.paragraphs[0]
-                            header_run = header_para.add_run(self.header_text)
-                            header_run.font.size = Pt(10)
-                            header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                except:
-                    pass  # Skip header if error
-                
-                # Add footer safely
-                try:
-                    footer = section.footer
-                    if footer.paragraphs:
-                        footer.paragraphs[0].text = ''
-                    
-                    if self.footer_line1 and self.footer_line1.strip():
-                        footer_para1 = footer.add_paragraph()
-                        footer_run1 = footer_para1.add_run(self.footer_line1)
-                        footer_run1.font.size = Pt(9)
-                        footer_para1.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    
-                    if self.footer_line2 and self.footer_line2.strip():
-                        footer_para2 = footer.add_paragraph()
-                        footer_run2 = footer_para2.add_run(self.footer_line2)
-                        footer_run2.font.size = Pt(9)
-                        footer_para2.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                except:
-                    pass  # Skip footer if error
-            
-            # Step 5: Get all page keys safely
-            if not self.page_photos:
-                doc.save(filename)
+            # Nothing changed since last save - copy that file instead of regenerating
+            save_hash = self._export_state_hash(current_layout)
+            if (save_hash == self._last_save_hash and self._last_save_path
+                    and os.path.exists(self._last_save_path)):
+                if os.path.abspath(self._last_save_path) != os.path.abspath(filename):
+                    shutil.copyfile(self._last_save_path, filename)
                 return
             
-            page_keys = sorted(self.page_photos.keys(), 
-                             key=lambda x: (int(x.split('_')[0]), int(x.split('_')[1])))
+            # Step 3 & 4: Create document with margins, header and footer from template
+            doc = self._new_document()
             
-            if not page_keys:
-                doc.save(filename)
+            # Step 5: Collect photos per page and find the last page that has any, in one pass
+            photos_by_page = []
+            max_page = -1
+            for page_num, page in enumerate(self._pages):
+                page_photos_list = [
+                    (i, photo_path, caption)
+                    for i, (photo_path, caption) in enumerate(page)
+                    if photo_path is not None
+                ]
+                photos_by_page.append(page_photos_list)
+                if page_photos_list:
+                    max_page = page_num
+            
+            if max_page < 0:
+                self._write_document(doc, filename)
                 return
             
-            max_page = max([int(k.split('_')[0]) for k in page_keys])
+            # Compress all photos in parallel up front - Pillow releases the GIL while
+            # decoding and resizing; the python-docx assembly below stays serial.
+            # Fewer workers on Android to bound memory.
+            workers = 4 if platform == 'android' else os.cpu_count()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for page_photos_list in photos_by_page:
+                    for _, photo_path, _ in page_photos_list:
+                        if photo_path not in compressed:
+                            compressed[photo_path] = pool.submit(self.compress_image, photo_path)
             
             # Step 6: Generate ALL pages (not just current page)
+            pictures = {}  # compressed image path -> (rId, image) already embedded
+            all_embedded = True  # False once any cell falls back to an error placeholder
             for page_num in range(max_page + 1):
-                # Collect photos for this page using the CORRECT photos_per_page
-                page_photos_list = []
-                for i in range(photos_per_page):
-                    page_key = f'{page_num}_{i}'
-                    if page_key in self.page_photos:
-                        page_photos_list.append((i, self.page_photos[page_key]))
+                page_photos_list = photos_by_page[page_num]
                 
                 if not page_photos_list:
                     continue
@@ -976,19 +1191,13 @@ class PhotoGridApp(App):
                 title = doc.add_paragraph()
                 page_title_text = self.page_titles.get(page_num, 'Title')
                 title_run = title.add_run(page_title_text)
-                title_run.font.size = Pt(self.title_font_size)
+                title_run.font.size = title_font_size
                 title_run.font.bold = self.title_bold
                 title_run.font.underline = self.title_underline
                 title.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 
-                # Spacing that FITS on one page (tested and verified)
-                if current_layout == '2x1':
-                    title.space_after = Pt(2)
-                    title.space_before = Pt(0)
-                else:
-                    # Compact spacing for 2x2 layout
-                    title.space_after = Pt(4)
-                    title.space_before = Pt(0)
+                title.space_after = space_after_title
+                title.space_before = space_zero
                 
                 # Create table
                 table = doc.add_table(rows=rows, cols=cols)
@@ -999,72 +1208,63 @@ class PhotoGridApp(App):
                 for col in table.columns:
                     col.width = col_width
                 
+                # Resolve cells once per row - python-docx cell lookup walks the table XML
+                row_cells = []
                 for row in table.rows:
                     row.height = row_height
+                    row_cells.append(row.cells)
                 
                 # Add photos to table
-                for grid_idx, photo_path in page_photos_list:
+                for grid_idx, photo_path, caption_text in page_photos_list:
                     try:
                         row_idx = grid_idx // cols
                         col_idx = grid_idx % cols
                         
-                        cell = table.rows[row_idx].cells[col_idx]
+                        cell = row_cells[row_idx][col_idx]
                         cell.vertical_alignment = 1
                         
                         paragraph = cell.paragraphs[0]
                         paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        paragraph.space_before = Pt(0)
-                        paragraph.space_after = Pt(0)
+                        paragraph.space_before = space_zero
+                        paragraph.space_after = space_zero
                         
                         # Add image
                         try:
-                            img = Image.open(photo_path)
-                            img_ratio = img.width / img.height
+                            compressed_path, img_width, img_height = compressed[photo_path].result()
+                            img_ratio = img_width / img_height
                             
-                            if img_ratio > (max_img_width.inches / max_img_height.inches):
+                            if img_ratio > max_img_ratio:
                                 use_width = max_img_width
                                 use_height = None
                             else:
                                 use_width = None
                                 use_height = max_img_height
                             
-                            compressed_img = self.compress_image(photo_path)
                             run = paragraph.add_run()
-                            if use_height:
-                                run.add_picture(compressed_img, height=use_height)
-                            else:
-                                run.add_picture(compressed_img, width=use_width)
+                            self._add_picture(run, compressed_path, use_width, use_height, pictures)
                         except:
+                            all_embedded = False
                             paragraph.add_run(f'[Error: {os.path.basename(photo_path)}]')
                         
                         # Add caption with layout-specific spacing (match desktop)
                         caption_para = cell.add_paragraph()
                         caption_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                        caption_para.space_before = space_before_caption
+                        caption_para.space_after = space_zero
                         
-                        # EXACT copy from desktop version
-                        if current_layout == '2x1':
-                            caption_para.space_before = Pt(2)  # Tighter spacing
-                            caption_para.space_after = Pt(0)
-                        else:
-                            # Tighter spacing for captions in 2x2 layout
-                            caption_para.space_before = Pt(2)  # Reduced from 3
-                            caption_para.space_after = Pt(0)
-                        
-                        page_key = f'{page_num}_{grid_idx}'
                         # Use saved caption or calculate sequential number
-                        if page_key in self.page_captions:
-                            caption_text = self.page_captions[page_key]
-                        else:
+                        if caption_text is None:
                             # Calculate sequential photo number across all pages
                             photo_num = page_num * photos_per_page + grid_idx + 1
                             caption_text = f'{self.caption_prefix} {photo_num}'
                         
                         caption_run = caption_para.add_run(caption_text)
-                        caption_run.font.size = Pt(self.caption_font_size)
+                        caption_run.font.size = caption_font_size
                         caption_run.font.bold = self.caption_bold
                         caption_run.font.underline = self.caption_underline
                     except Exception as e:
                         print(f'Error adding photo {grid_idx}: {e}')
+                        all_embedded = False
                         continue
                 
                 # Add page break if not last page
@@ -1073,59 +1273,218 @@ class PhotoGridApp(App):
                     doc.add_page_break()
             
             # Step 7: Save document
-            doc.save(filename)
+            self._write_document(doc, filename)
+            # Only reuse complete exports - a retry must rebuild a document with error placeholders
+            if all_embedded:
+                self._last_save_hash = save_hash
+                self._last_save_path = filename
             
         except Exception as e:
             print(f'Error generating document: {e}')
             raise
+        finally:
+            # Remove temp files written by compress_image (a photo may fill several cells,
+            # so they are only removed once the whole document is built)
+            for photo_path, future in compressed.items():
+                if future.done() and future.exception() is None:
+                    compressed_path = future.result()[0]
+                    if compressed_path != photo_path:
+                        try:
+                            os.remove(compressed_path)
+                        except OSError:
+                            pass
+    
+    def _export_state_hash(self, layout):
+        """Hash everything that affects the generated Word document"""
+        return hash((
+            tuple(tuple(page) for page in self._pages),
+            tuple((photo_path, _get_mtime(photo_path)) for photo_path in self.photos),
+            tuple(sorted(self.page_titles.items())),
+            layout, self.header_text, self.footer_line1, self.footer_line2,
+            self.title_font_size, self.title_bold, self.title_underline,
+            self.caption_font_size, self.caption_bold, self.caption_underline,
+            self.caption_prefix, self.jpeg_optimize
+        ))
+    
+    def _new_document(self):
+        """Create export document from a cached template with margins, header and footer"""
+        from docx import Document
+        from docx.shared import Inches, Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
+        # Rebuild the template only when header/footer text changed
+        template_key = (self.header_text, self.footer_line1, self.footer_line2)
+        if self._doc_template_key != template_key:
+            doc = Document()
+            
+            # Set margins - a new Document has exactly one section
+            section = doc.sections[0]
+            section.top_margin = Inches(0.8)
+            section.bottom_margin = Inches(0.8)
+            section.left_margin = Inches(0.5)
+            section.right_margin = Inches(0.5)
+            
+            # Add header
+            if self.header_text and self.header_text.strip():
+                header_para = section.header.paragraphs[0]
+                header_run = header_para.add_run(self.header_text)
+                header_run.font.size = Pt(10)
+                header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            # Add footer (python-docx creates it with one empty paragraph)
+            footer = section.footer
+            
+            if self.footer_line1 and self.footer_line1.strip():
+                footer_para1 = footer.add_paragraph()
+                footer_run1 = footer_para1.add_run(self.footer_line1)
+                footer_run1.font.size = Pt(9)
+                footer_para1.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            
+            if self.footer_line2 and self.footer_line2.strip():
+                footer_para2 = footer.add_paragraph()
+                footer_run2 = footer_para2.add_run(self.footer_line2)
+                footer_run2.font.size = Pt(9)
+                footer_para2.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            
+            template = io.BytesIO()
+            doc.save(template)
+            self._doc_template = template.getvalue()
+            self._doc_template_key = template_key
+        
+        return Document(io.BytesIO(self._doc_template))
+    
+    def _add_picture(self, run, image_path, width, height, pictures):
+        """Add inline picture to run, reusing the embedded image if already added"""
+        from docx.oxml.shape import CT_Inline
+        
+        # Same steps as Run.add_picture, minus re-reading and re-hashing repeated photos
+        part = run.part
+        if image_path not in pictures:
+            pictures[image_path] = part.get_or_add_image(image_path)
+        rId, image = pictures[image_path]
+        
+        cx, cy = image.scaled_dimensions(width, height)
+        inline = CT_Inline.new_pic_inline(part.next_id, rId, image.filename, cx, cy)
+        run._r.add_drawing(inline)
+    
+    def _write_document(self, doc, filename):
+        """Save document to filename with one large write instead of many small ones"""
+        buf = io.BytesIO()
+        doc.save(buf)
+        with open(filename, 'wb', buffering=1024 * 1024) as f:
+            f.write(buf.getvalue())
     
     def compress_image(self, image_path):
-        """Compress image for document"""
-        img = Image.open(image_path)
+        """Compress image for document into a temp file, returns (path, width, height)
         
-        if img.mode in ('RGBA', 'LA', 'P'):
-            img = img.convert('RGB')
+        The path is image_path itself if the photo can be embedded unchanged.
+        """
+        from PIL import Image
         
         max_size = (1600, 1600)
-        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-        
-        output = io.BytesIO()
-        img.save(output, format='JPEG', quality=92, optimize=True)
-        output.seek(0)
         
-        return output
+        with Image.open(image_path) as img:
+            # Already a small JPEG - embed the file as-is, no decode/re-encode
+            if img.format == 'JPEG' and img.width <= max_size[0] and img.height <= max_size[1]:
+                return image_path, img.width, img.height
+            
+            # JPEG only: let libjpeg downscale during decode. draft() needs the
+            # requested size in both dimensions, so ask for the final aspect-kept size
+            scale = min(max_size[0] / img.width, max_size[1] / img.height)
+            img.draft('RGB', (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+            img.load()
+            
+            # Resize first so the RGB convert runs on at most 1600x1600 pixels.
+            # Palette images must be expanded first - Pillow resizes them with NEAREST only
+            if img.mode == 'P':
+                img = img.convert('RGB')
+            
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+            
+            if img.mode in ('RGBA', 'LA'):
+                img = img.convert('RGB')
+            
+            # Spill to disk rather than holding every compressed photo in memory
+            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as output:
+                try:
+                    # Extra Huffman pass only if user asked for smaller files
+                    img.save(output, format='JPEG', quality=88,
+                             optimize=self.jpeg_optimize, progressive=False)
+                except Exception:
+                    # delete=False means nobody else will clean up the half-written file
+                    output.close()
+                    os.remove(output.name)
+                    raise
+            
+            return output.name, img.width, img.height
     
     def show_message(self, title, message):
-        """Show popup message"""
-        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        content.add_widget(Label(text=message))
-        
-        ok_btn = Button(text='OK', size_hint=(1, 0.3))
-        content.add_widget(ok_btn)
+        """Show popup message, reusing one popup for all messages"""
+        if self._message_popup is None:
+            content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+            self._msg_label = Label(text=message)
+            content.add_widget(self._msg_label)
+            
+            ok_btn = Button(text='OK', size_hint=(1, 0.3))
+            content.add_widget(ok_btn)
+            
+            self._message_popup = Popup(title=title, content=content, size_hint=(0.8, 0.4))
+            ok_btn.bind(on_press=self._message_popup.dismiss)
         
-        popup = Popup(title=title, content=content, size_hint=(0.8, 0.4))
-        ok_btn.bind(on_press=popup.dismiss)
-        popup.open()
+        self._msg_label.text = message
+        self._message_popup.title = title
+        self._message_popup.open()
+    
+    def _settings_dict(self):
+        """Get settings to persist as a dict"""
+        return {
+            'caption_prefix': self.caption_prefix,
+            'header_text': self.header_text,
+            'footer_line1': self.footer_line1,
+            'footer_line2': self.footer_line2,
+            'grid_layout': self.grid_layout_type,
+            'last_photo_path': self.last_photo_path,
+            'title_font_size': self.title_font_size,
+            'title_bold': self.title_bold,
+            'title_underline': self.title_underline,
+            'caption_font_size': self.caption_font_size,
+            'caption_bold': self.caption_bold,
+            'caption_underline': self.caption_underline,
+            'jpeg_optimize': self.jpeg_optimize
+        }
     
     def save_settings(self):
-        """Save settings to JSON"""
+        """Schedule a settings save, collapsing rapid changes into one write"""
+        if self._settings_write_scheduled:
+            self._settings_write_scheduled.cancel()
+        self._settings_write_scheduled = Clock.schedule_once(lambda dt: self._do_save_settings(), 0.5)
+    
+    def flush_settings(self):
+        """Write any pending settings change immediately"""
+        if self._settings_write_scheduled:
+            self._settings_write_scheduled.cancel()
+            self._do_save_settings()
+    
+    def _do_save_settings(self):
+        """Save settings to JSON, skipping the write if nothing changed"""
+        self._settings_write_scheduled = None
         try:
-            settings = {
-                'caption_prefix': self.caption_prefix,
-                'header_text': self.header_text,
-                'footer_line1': self.footer_line1,
-                'footer_line2': self.footer_line2,
-                'grid_layout': self.grid_layout_type,
-                'last_photo_path': self.last_photo_path,
-                'title_font_size': self.title_font_size,
-                'title_bold': self.title_bold,
-                'title_underline': self.title_underline,
-                'caption_font_size': self.caption_font_size,
-                'caption_bold': self.caption_bold,
-                'caption_underline': self.caption_underline
-            }
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=2)
+            settings = self._settings_dict()
+            if orjson is not None:
+                blob = orjson.dumps(settings)
+            else:
+                blob = json.dumps(settings, separators=(',', ':')).encode('utf-8')
+            if blob == self._last_settings_blob:
+                return
+            
+            # Write to temp file then swap in, so a killed app can't leave a partial file
+            tmp_file = self.settings_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())  # Make sure data is on flash before the swap
+            os.replace(tmp_file, self.settings_file)
+            self._last_settings_blob = blob
         except Exception as e:
             print(f'Failed to save settings: {e}')
     
@@ -1133,13 +1492,15 @@ class PhotoGridApp(App):
         """Load settings from JSON"""
         try:
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
+                with open(self.settings_file, 'rb') as f:
+                    blob = f.read()
+                settings = json.loads(blob)  # Accepts UTF-8 bytes from either serializer
+                self._last_settings_blob = blob  # Saving unchanged settings is a no-op
                 
                 self.caption_prefix = settings.get('caption_prefix', 'Photo')
                 self.header_text = settings.get('header_text', '')
                 self.footer_line1 = settings.get('footer_line1', 'File Ref. :')
-                self.footer_line2 = settings.get('footer_line2', f'Photo taken on {datetime.now().strftime("%d.%m.%Y")}')
+                self.footer_line2 = settings.get('footer_line2')
                 
                 # Load grid layout and sync photos_per_page
                 # Always default to 2x2 for new sessions
@@ -1160,6 +1521,7 @@ class PhotoGridApp(App):
                 self.caption_font_size = settings.get('caption_font_size', 10)
                 self.caption_bold = settings.get('caption_bold', False)
                 self.caption_underline = settings.get('caption_underline', False)
+                self.jpeg_optimize = settings.get('jpeg_optimize', False)
                 
                 print(f"DEBUG: Loaded settings - grid_layout_type: {self.grid_layout_type}, photos_per_page: {self.photos_per_page}")
         except Exception as e: